@@ -11,6 +11,20 @@ cd "$PROJECT_ROOT"
 export FLASK_APP=src/web/web_interface.py
 export FLASK_ENV=production
 
-# Run the Flask application directly on port 5000
+# FLASK_DEBUG=true runs the single-process development server with the debugger
+if [ "${FLASK_DEBUG:-false}" = "true" ]; then
+    echo "Starting Supabase Project Generator Web Interface (debug) on port 5000..."
+    exec python3 "$PROJECT_ROOT/src/web/web_interface.py"
+fi
+
+# Otherwise serve with Hypercorn, on uvloop when it is installed. Creation
+# jobs and event streams live in process memory, so a job's page has to be
+# served by the worker that started it: keep one (async) worker by default
+WORKER_CLASS=asyncio
+if python3 -c 'import uvloop' 2>/dev/null; then
+    WORKER_CLASS=uvloop
+fi
+
 echo "Starting Supabase Project Generator Web Interface on port 5000..."
-python3 "$PROJECT_ROOT/src/web/web_interface.py"
+exec hypercorn --workers "${WEB_WORKERS:-1}" --worker-class "$WORKER_CLASS" \
+    --bind 0.0.0.0:5000 src.web.web_interface:app
@@ -8,39 +8,126 @@ import sys
 import os
 import argparse
 import json
+import re
+import functools
 from pathlib import Path
-from colorama import init, Fore, Style
+from colorama import Fore, Style
 
-# Initialize colorama for cross-platform colored output
-init()
+_COLOR = sys.stdout.isatty()
+
+# colorama only needs to patch stdout for an interactive Windows console
+if _COLOR and sys.platform == 'win32':
+    from colorama import init as _colorama_init
+    _colorama_init()
+
+# ANSI sequences used by the print helpers; empty when output is piped,
+# matching what colorama's stripping used to do
+_GREEN = Fore.GREEN if _COLOR else ''
+_RED = Fore.RED if _COLOR else ''
+_YELLOW = Fore.YELLOW if _COLOR else ''
+_BLUE = Fore.BLUE if _COLOR else ''
+_CYAN = Fore.CYAN if _COLOR else ''
+_RESET = Style.RESET_ALL if _COLOR else ''
+
+# Full prefixes and suffix for the print_* helpers
+_OK_PREFIX = _GREEN + '✅ '
+_ERR_PREFIX = _RED + '❌ '
+_WARN_PREFIX = _YELLOW + '⚠️  '
+_INFO_PREFIX = _BLUE + 'ℹ️  '
+_MSG_SUFFIX = _RESET + '\n'
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from src.core.main import SupabaseProjectGenerator
+from src.core.config import load_config, load_config_summary, loads as _parse
+
+# Same location SupabaseProjectGenerator uses, so filesystem-only commands
+# don't have to import and construct the generator
+PROJECTS_DIR = os.environ.get('SUPABASE_PROJECTS_DIR',
+                              os.path.join(os.path.expanduser('~'), 'supabase_projects'))
+
+DOCKER_SOCKET = os.environ.get('DOCKER_SOCKET', '/var/run/docker.sock')
+
+
+def _section(title, rule=0):
+    """Colored section header, optionally underlined with a rule of dashes"""
+    header = f"\n{_CYAN}{title}{_RESET}"
+    return f"{header}\n{'-' * rule}" if rule else header
+
+
+def _docker_filters(**filters):
+    """Encode filters for a Docker Engine API query string"""
+    from urllib.parse import quote
+    return quote(json.dumps(filters, separators=(',', ':')))
+
+
+def _docker_api_get(path):
+    """GET a Docker Engine API path over the local unix socket.
+
+    Talking to the daemon directly avoids forking the docker CLI. Returns
+    the decoded JSON body, or None when the socket can't be used.
+    """
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(2)
+            s.connect(DOCKER_SOCKET)
+            # HTTP/1.0 keeps the daemon from chunking the response
+            s.sendall(f"GET {path} HTTP/1.0\r\nHost: docker\r\n\r\n".encode())
+            chunks = []
+            while True:
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except (OSError, AttributeError):  # AttributeError: no AF_UNIX on Windows
+        return None
+    
+    head, _, body = b''.join(chunks).partition(b'\r\n\r\n')
+    if head.split(b' ', 2)[1:2] != [b'200']:
+        return None
+    try:
+        return _parse(body)
+    except ValueError:
+        return None
+
+
+def _compose_project_name(name):
+    """Normalize a project directory name the way docker compose does"""
+    return re.sub(r'[^a-z0-9_-]', '', name.lower())
 
 
 class SupabaseCLI:
     """Command-line interface for Supabase Project Generator"""
     
     def __init__(self):
-        self.generator = SupabaseProjectGenerator()
+        self._projects_dir = Path(PROJECTS_DIR)
+    
+    @functools.cached_property
+    def generator(self):
+        """Project generator, imported and constructed on first use"""
+        from src.core.main import SupabaseProjectGenerator
+        return SupabaseProjectGenerator()
+    
+    def _config_path(self, name):
+        """Path of a project's supabase_config.json"""
+        return self._projects_dir / name / 'supabase_config.json'
         
     def print_success(self, message):
         """Print success message in green"""
-        print(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
+        sys.stdout.write(f"{_OK_PREFIX}{message}{_MSG_SUFFIX}")
         
     def print_error(self, message):
         """Print error message in red"""
-        print(f"{Fore.RED}❌ {message}{Style.RESET_ALL}")
+        sys.stdout.write(f"{_ERR_PREFIX}{message}{_MSG_SUFFIX}")
         
     def print_warning(self, message):
         """Print warning message in yellow"""
-        print(f"{Fore.YELLOW}⚠️  {message}{Style.RESET_ALL}")
+        sys.stdout.write(f"{_WARN_PREFIX}{message}{_MSG_SUFFIX}")
         
     def print_info(self, message):
         """Print info message in blue"""
-        print(f"{Fore.BLUE}ℹ️  {message}{Style.RESET_ALL}")
+        sys.stdout.write(f"{_INFO_PREFIX}{message}{_MSG_SUFFIX}")
 
     def create_project(self, args):
         """Create a new Supabase project"""
@@ -70,19 +157,19 @@ class SupabaseCLI:
             self.print_info(f"Location: {project_path}")
             
             # Display project info
-            config_path = os.path.join(project_path, "supabase_config.json")
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                
-                print(f"\n{Fore.CYAN}🌐 Access URLs:{Style.RESET_ALL}")
-                print(f"  Studio:   http://{config['machine_ip']}:{config['ports']['studio']}")
-                print(f"  API:      http://{config['machine_ip']}:{config['ports']['kong']}")
-                print(f"  Database: {config['db_config']['host']}:{config['db_config']['port']}")
-                
-                print(f"\n{Fore.CYAN}🔑 API Keys:{Style.RESET_ALL}")
-                print(f"  Anon:     {config['anon_key']}")
-                print(f"  Service:  {config['service_key']}")
+            # The generator keeps the config it just wrote, no need to re-read it
+            config = self.generator.last_config
+            if config:
+                lines = [
+                    _section("🌐 Access URLs:"),
+                    f"  Studio:   http://{config['machine_ip']}:{config['ports']['studio']}",
+                    f"  API:      http://{config['machine_ip']}:{config['ports']['kong']}",
+                    f"  Database: {config['db_config']['host']}:{config['db_config']['port']}",
+                    _section("🔑 API Keys:"),
+                    f"  Anon:     {config['anon_key']}",
+                    f"  Service:  {config['service_key']}",
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
                 
         except Exception as e:
             self.print_error(f"Failed to create project: {str(e)}")
@@ -93,49 +180,55 @@ class SupabaseCLI:
     def list_projects(self, args):
         """List all Supabase projects"""
         try:
-            projects_dir = self.generator.projects_dir
-            
-            if not os.path.exists(projects_dir):
+            # scandir reports the entry type from the directory read itself, only
+            # symlinked projects cost a stat to follow
+            try:
+                with os.scandir(PROJECTS_DIR) as it:
+                    projects = sorted((e for e in it if e.is_dir()),
+                                      key=lambda e: e.name)
+            except FileNotFoundError:
                 self.print_info("No projects directory found. No projects created yet.")
                 return 0
-                
-            projects = [d for d in os.listdir(projects_dir) 
-                       if os.path.isdir(os.path.join(projects_dir, d))]
             
             if not projects:
                 self.print_info("No projects found.")
                 return 0
             
-            print(f"\n{Fore.CYAN}📋 Supabase Projects:{Style.RESET_ALL}")
-            print("-" * 60)
+            # Build the whole listing and write it in one go
+            lines = [_section("📋 Supabase Projects:", rule=60)]
+            
+            # One docker call answers the status of every project
+            running = self._running_projects_set()
             
-            for project in sorted(projects):
-                project_path = os.path.join(projects_dir, project)
-                config_path = os.path.join(project_path, "supabase_config.json")
+            # Config reads are independent I/O, overlap them
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(8, len(projects))) as executor:
+                results = list(executor.map(self._read_config_safe, projects))
+            
+            for project, config, problem in results:
+                if problem:
+                    lines += [f"⚠️  {project} ({problem})", ""]
+                    continue
                 
-                if os.path.exists(config_path):
-                    try:
-                        with open(config_path, 'r') as f:
-                            config = json.load(f)
-                        
-                        # Check if project is running
-                        status = self._check_project_status(project)
-                        status_icon = "🟢" if status else "🔴"
-                        status_text = "Running" if status else "Stopped"
-                        
-                        print(f"{status_icon} {project}")
-                        print(f"   Size: {config.get('machine_size', 'unknown')}")
-                        print(f"   Created: {config.get('created_at', 'unknown')}")
-                        print(f"   Status: {status_text}")
-                        print(f"   Studio: http://{config['machine_ip']}:{config['ports']['studio']}")
-                        print()
-                        
-                    except Exception:
-                        print(f"⚠️  {project} (config error)")
-                        print()
-                else:
-                    print(f"⚠️  {project} (no config)")
-                    print()
+                try:
+                    # Check if project is running
+                    status = _compose_project_name(project) in running
+                    status_icon = "🟢" if status else "🔴"
+                    status_text = "Running" if status else "Stopped"
+                    
+                    lines += [
+                        f"{status_icon} {project}",
+                        f"   Size: {config.get('machine_size', 'unknown')}",
+                        f"   Created: {config.get('created_at', 'unknown')}",
+                        f"   Status: {status_text}",
+                        f"   Studio: http://{config['machine_ip']}:{config['ports']['studio']}",
+                        "",
+                    ]
+                    
+                except Exception:
+                    lines += [f"⚠️  {project} (config error)", ""]
+            
+            sys.stdout.write("\n".join(lines) + "\n")
                     
         except Exception as e:
             self.print_error(f"Failed to list projects: {str(e)}")
@@ -143,6 +236,19 @@ class SupabaseCLI:
             
         return 0
 
+    def _read_config_safe(self, entry):
+        """Load a listed project's config.
+
+        Returns (name, config, problem) where problem is None on success.
+        """
+        try:
+            config = load_config_summary(entry.path + os.sep + "supabase_config.json")
+        except FileNotFoundError:
+            return entry.name, None, "no config"
+        except Exception:
+            return entry.name, None, "config error"
+        return entry.name, config, None
+
     def start_project(self, args):
         """Start a Supabase project"""
         try:
@@ -154,16 +260,16 @@ class SupabaseCLI:
                 self.print_success(f"Project '{args.name}' started successfully!")
                 
                 # Show project URLs
-                project_path = os.path.join(self.generator.projects_dir, args.name)
-                config_path = os.path.join(project_path, "supabase_config.json")
-                
-                if os.path.exists(config_path):
-                    with open(config_path, 'r') as f:
-                        config = json.load(f)
-                    
-                    print(f"\n{Fore.CYAN}🌐 Access URLs:{Style.RESET_ALL}")
-                    print(f"  Studio: http://{config['machine_ip']}:{config['ports']['studio']}")
-                    print(f"  API:    http://{config['machine_ip']}:{config['ports']['kong']}")
+                try:
+                    config = load_config(self._config_path(args.name))
+                except FileNotFoundError:
+                    pass
+                else:
+                    sys.stdout.write(
+                        f"{_section('🌐 Access URLs:')}\n"
+                        f"  Studio: http://{config['machine_ip']}:{config['ports']['studio']}\n"
+                        f"  API:    http://{config['machine_ip']}:{config['ports']['kong']}\n"
+                    )
                     
             else:
                 self.print_error(f"Failed to start project '{args.name}'")
@@ -229,42 +335,40 @@ class SupabaseCLI:
     def status_project(self, args):
         """Show project status"""
         try:
-            project_path = os.path.join(self.generator.projects_dir, args.name)
-            config_path = os.path.join(project_path, "supabase_config.json")
-            
-            if not os.path.exists(config_path):
+            try:
+                config = load_config(self._config_path(args.name))
+            except FileNotFoundError:
                 self.print_error(f"Project '{args.name}' not found")
                 return 1
             
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-            
-            print(f"\n{Fore.CYAN}📊 Project Status: {args.name}{Style.RESET_ALL}")
-            print("-" * 50)
-            
             # Check if project is running
             status = self._check_project_status(args.name)
             status_icon = "🟢" if status else "🔴"
             status_text = "Running" if status else "Stopped"
             
-            print(f"Status: {status_icon} {status_text}")
-            print(f"Size: {config.get('machine_size', 'unknown')}")
-            print(f"Specs: {config.get('specs', 'unknown')}")
-            print(f"Created: {config.get('created_at', 'unknown')}")
-            
-            print(f"\n{Fore.CYAN}🌐 Service URLs:{Style.RESET_ALL}")
-            for service, port in config['ports'].items():
-                print(f"  {service.title()}: http://{config['machine_ip']}:{port}")
-            
-            print(f"\n{Fore.CYAN}🗄️ Database:{Style.RESET_ALL}")
-            print(f"  Host: {config['db_config']['host']}")
-            print(f"  Port: {config['db_config']['port']}")
-            print(f"  Database: {config['db_config']['database']}")
-            print(f"  User: {config['db_config']['user']}")
-            
-            print(f"\n{Fore.CYAN}🔑 API Keys:{Style.RESET_ALL}")
-            print(f"  Anon: {config['anon_key']}")
-            print(f"  Service: {config['service_key']}")
+            machine_ip = config['machine_ip']
+            db_config = config['db_config']
+            lines = [
+                _section(f"📊 Project Status: {args.name}", rule=50),
+                f"Status: {status_icon} {status_text}",
+                f"Size: {config.get('machine_size', 'unknown')}",
+                f"Specs: {config.get('specs', 'unknown')}",
+                f"Created: {config.get('created_at', 'unknown')}",
+                _section("🌐 Service URLs:"),
+            ]
+            lines += [f"  {service.title()}: http://{machine_ip}:{port}"
+                      for service, port in config['ports'].items()]
+            lines += [
+                _section("🗄️ Database:"),
+                f"  Host: {db_config['host']}",
+                f"  Port: {db_config['port']}",
+                f"  Database: {db_config['database']}",
+                f"  User: {db_config['user']}",
+                _section("🔑 API Keys:"),
+                f"  Anon: {config['anon_key']}",
+                f"  Service: {config['service_key']}",
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
             
         except Exception as e:
             self.print_error(f"Failed to get project status: {str(e)}")
@@ -272,32 +376,155 @@ class SupabaseCLI:
             
         return 0
 
-    def _check_project_status(self, project_name):
-        """Check if a project is currently running"""
+    def _running_projects_set(self):
+        """Return the compose project names that have running containers"""
+        containers = _docker_api_get(
+            '/containers/json?filters=' + _docker_filters(label=['com.docker.compose.project'])
+        )
+        if containers is not None:
+            return {c['Labels']['com.docker.compose.project'] for c in containers}
+        
+        # No access to the docker socket, ask the CLI instead
+        import subprocess
         try:
-            project_path = os.path.join(self.generator.projects_dir, project_name)
-            compose_file = os.path.join(project_path, 'docker-compose.yml')
-            
-            if not os.path.exists(compose_file):
-                return False
-            
-            # Use docker compose ps to check status
-            import subprocess
             result = subprocess.run(
-                ['docker', 'compose', 'ps', '--services', '--filter', 'status=running'],
-                cwd=project_path,
+                ['docker', 'ps', '--format', '{{.Label "com.docker.compose.project"}}'],
                 capture_output=True,
                 text=True
             )
+        except Exception:
+            return set()
+        
+        if result.returncode != 0:
+            return set()
+        return {line for line in result.stdout.splitlines() if line}
+
+    def _check_project_status(self, project_name):
+        """Check if a project is currently running"""
+        try:
+            label = f'com.docker.compose.project={_compose_project_name(project_name)}'
+            containers = _docker_api_get('/containers/json?filters=' + _docker_filters(label=[label]))
+            if containers is not None:
+                return bool(containers)
+            
+            # Fall back to docker compose ps; only the exit code and whether
+            # any container IDs come back matter, so keep the pipes minimal
+            # and skip closing inherited fds in the child
+            # A missing project directory raises here and reads as stopped
+            import subprocess
+            proc = subprocess.Popen(
+                ['docker', 'compose', 'ps', '-q', '--filter', 'status=running'],
+                cwd=self._projects_dir / project_name,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                close_fds=False
+            )
+            out, _ = proc.communicate()
             
-            return result.returncode == 0 and result.stdout.strip()
+            return proc.returncode == 0 and bool(out.strip())
             
         except Exception:
             return False
 
+# Command name -> SupabaseCLI method
+_DISPATCH = {
+    'create': SupabaseCLI.create_project,
+    'list': SupabaseCLI.list_projects,
+    'start': SupabaseCLI.start_project,
+    'stop': SupabaseCLI.stop_project,
+    'delete': SupabaseCLI.delete_project,
+    'status': SupabaseCLI.status_project,
+}
 
-def main():
-    """Main CLI entry point"""
+
+def _build_create(subparsers):
+    create_parser = subparsers.add_parser('create', help='Create a new Supabase project')
+    create_parser.add_argument('--name', required=True, help='Project name')
+    create_parser.add_argument('--size', choices=['small', 'medium', 'large', 'xlarge'], 
+                              default='medium', help='Machine size (default: medium)')
+    create_parser.add_argument('--specs', help='Machine specifications (e.g., "4CPU/8GB RAM")')
+    create_parser.add_argument('--db-host', help='PostgreSQL host (default: 192.168.1.43)')
+    create_parser.add_argument('--db-port', help='PostgreSQL port (default: 5432)')
+    create_parser.add_argument('--db-user', help='PostgreSQL user (default: postgres)')
+    create_parser.add_argument('--db-password', help='PostgreSQL password')
+
+
+def _build_list(subparsers):
+    subparsers.add_parser('list', help='List all projects')
+
+
+def _build_start(subparsers):
+    start_parser = subparsers.add_parser('start', help='Start a project')
+    start_parser.add_argument('name', help='Project name')
+
+
+def _build_stop(subparsers):
+    stop_parser = subparsers.add_parser('stop', help='Stop a project')
+    stop_parser.add_argument('name', help='Project name')
+
+
+def _build_delete(subparsers):
+    delete_parser = subparsers.add_parser('delete', help='Delete a project')
+    delete_parser.add_argument('name', help='Project name')
+    delete_parser.add_argument('--force', action='store_true', help='Skip confirmation')
+
+
+def _build_status(subparsers):
+    status_parser = subparsers.add_parser('status', help='Show project status')
+    status_parser.add_argument('name', help='Project name')
+
+
+VERSION = 'Supabase Project Generator 1.0.0'
+
+# Top-level help as argparse renders it, so help needs no parser at all.
+# Keep in sync with _build_parser() and BUILDERS.
+_STATIC_HELP = """\
+usage: %(prog)s [-h] [--version] {create,list,start,stop,delete,status} ...
+
+Supabase Project Generator - Create and manage Supabase projects
+
+positional arguments:
+  {create,list,start,stop,delete,status}
+                        Available commands
+    create              Create a new Supabase project
+    list                List all projects
+    start               Start a project
+    stop                Stop a project
+    delete              Delete a project
+    status              Show project status
+
+options:
+  -h, --help            show this help message and exit
+  --version             show program's version number and exit
+
+Examples:
+  %(prog)s create --name myapp --size medium
+  %(prog)s list
+  %(prog)s start myapp
+  %(prog)s stop myapp
+  %(prog)s status myapp
+  %(prog)s delete myapp --force
+        
+"""
+
+# Subcommand parser builders, in the order they appear in --help
+BUILDERS = {
+    'create': _build_create,
+    'list': _build_list,
+    'start': _build_start,
+    'stop': _build_stop,
+    'delete': _build_delete,
+    'status': _build_status,
+}
+
+
+def _build_parser(argv):
+    """Build the argument parser.
+
+    Only the subparser for the requested command is constructed; help,
+    unknown commands and bare options get the full parser.
+    """
     parser = argparse.ArgumentParser(
         description="Supabase Project Generator - Create and manage Supabase projects",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -312,40 +539,36 @@ Examples:
         """
     )
     
-    parser.add_argument('--version', action='version', version='Supabase Project Generator 1.0.0')
-    
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
-    # Create command
-    create_parser = subparsers.add_parser('create', help='Create a new Supabase project')
-    create_parser.add_argument('--name', required=True, help='Project name')
-    create_parser.add_argument('--size', choices=['small', 'medium', 'large', 'xlarge'], 
-                              default='medium', help='Machine size (default: medium)')
-    create_parser.add_argument('--specs', help='Machine specifications (e.g., "4CPU/8GB RAM")')
-    create_parser.add_argument('--db-host', help='PostgreSQL host (default: 192.168.1.43)')
-    create_parser.add_argument('--db-port', help='PostgreSQL port (default: 5432)')
-    create_parser.add_argument('--db-user', help='PostgreSQL user (default: postgres)')
-    create_parser.add_argument('--db-password', help='PostgreSQL password')
+    parser.add_argument('--version', action='version', version=VERSION)
     
-    # List command
-    list_parser = subparsers.add_parser('list', help='List all projects')
+    # Name every command even when only one subparser gets built, so usage
+    # lines in error messages match _STATIC_HELP
+    subparsers = parser.add_subparsers(dest='command', help='Available commands',
+                                       metavar='{' + ','.join(BUILDERS) + '}')
     
-    # Start command
-    start_parser = subparsers.add_parser('start', help='Start a project')
-    start_parser.add_argument('name', help='Project name')
+    command = argv[0] if argv else None
+    if command in BUILDERS:
+        BUILDERS[command](subparsers)
+    else:
+        for build in BUILDERS.values():
+            build(subparsers)
     
-    # Stop command
-    stop_parser = subparsers.add_parser('stop', help='Stop a project')
-    stop_parser.add_argument('name', help='Project name')
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    argv = sys.argv[1:]
     
-    # Delete command
-    delete_parser = subparsers.add_parser('delete', help='Delete a project')
-    delete_parser.add_argument('name', help='Project name')
-    delete_parser.add_argument('--force', action='store_true', help='Skip confirmation')
+    # Answer help and --version without building a parser
+    if not argv or argv[0] in ('-h', '--help'):
+        sys.stdout.write(_STATIC_HELP % {'prog': os.path.basename(sys.argv[0])})
+        return 0 if argv else 1
+    if argv[0] == '--version':
+        sys.stdout.write(VERSION + '\n')
+        return 0
     
-    # Status command
-    status_parser = subparsers.add_parser('status', help='Show project status')
-    status_parser.add_argument('name', help='Project name')
+    parser = _build_parser(argv)
     
     # Parse arguments
     args = parser.parse_args()
@@ -358,21 +581,11 @@ Examples:
     cli = SupabaseCLI()
     
     # Execute command
-    if args.command == 'create':
-        return cli.create_project(args)
-    elif args.command == 'list':
-        return cli.list_projects(args)
-    elif args.command == 'start':
-        return cli.start_project(args)
-    elif args.command == 'stop':
-        return cli.stop_project(args)
-    elif args.command == 'delete':
-        return cli.delete_project(args)
-    elif args.command == 'status':
-        return cli.status_project(args)
-    else:
+    handler = _DISPATCH.get(args.command)
+    if handler is None:
         parser.print_help()
         return 1
+    return handler(cli, args)
 
 
 if __name__ == '__main__':
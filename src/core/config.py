@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Cached loading of project supabase_config.json files, shared by the CLI and
+the web interface
+"""
+
+import os
+import mmap
+import functools
+
+# Prefer orjson for parsing project configs, fall back to the stdlib
+try:
+    from orjson import loads
+    _PARSE_BUFFERS = True
+except ImportError:
+    from json import loads
+    _PARSE_BUFFERS = False
+
+# Configs larger than this are parsed straight from a read-only mapping
+# instead of being copied into a bytes object first
+_MMAP_THRESHOLD = 4096
+
+# Streams only the summary fields out of very large configs; listed in
+# config/requirements.txt, without it those configs are parsed whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_STREAM_THRESHOLD = 8192
+SUMMARY_KEYS = frozenset(('machine_size', 'created_at', 'machine_ip', 'ports'))
+
+
+def _read_file(path, size):
+    """Read a whole file with raw os calls, skipping the file-object layer"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=512)
+def _load_config_cached(config_path, mtime_ns, size):
+    """Parse a config file, memoized on its stat signature"""
+    if _PARSE_BUFFERS and size > _MMAP_THRESHOLD:
+        with open(config_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            return loads(view)
+    return loads(_read_file(config_path, size))
+
+
+@functools.lru_cache(maxsize=512)
+def _load_summary_cached(config_path, mtime_ns, size):
+    """Stream the SUMMARY_KEYS fields out of a config file"""
+    summary = {}
+    with open(config_path, 'rb') as f:
+        for key, value in ijson.kvitems(f, ''):
+            if key in SUMMARY_KEYS:
+                summary[key] = value
+                if len(summary) == len(SUMMARY_KEYS):
+                    break
+    return summary
+
+
+def load_config(config_path, st=None):
+    """Load a config file, reusing the parsed dict until the file changes.
+
+    Pass st when the caller has already stat()ed the file. Raises
+    FileNotFoundError when there is no config. The returned dict is shared
+    between callers and must not be mutated.
+    """
+    if st is None:
+        st = os.stat(config_path)
+    return _load_config_cached(config_path, st.st_mtime_ns, st.st_size)
+
+
+def load_config_summary(config_path):
+    """Load at least the SUMMARY_KEYS fields, without holding large configs whole.
+
+    Raises FileNotFoundError when there is no config. Like load_config, the
+    result is shared.
+    """
+    st = os.stat(config_path)
+    if ijson is not None and st.st_size > _STREAM_THRESHOLD:
+        return _load_summary_cached(config_path, st.st_mtime_ns, st.st_size)
+    return _load_config_cached(config_path, st.st_mtime_ns, st.st_size)
@@ -3,68 +3,204 @@
 import os
 import sys
 import json
+import mmap
 import secrets
+import string
 import subprocess
+import shutil
 import argparse
-import jwt
+import hmac
 import hashlib
 import base64
 import socket
+import selectors
+import errno
 import psutil
 import logging
 import threading
 import time
+import atexit
+import queue
+import collections
+import functools
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 from jinja2 import Environment, FileSystemLoader
 
+# Only needed by run_locally(), which reports when it is missing
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+def _b64url(data):
+    """Base64url-encode bytes without padding, as JWT requires"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+# Project refs are 20 lowercase alphanumerics, like Supabase's own
+_REF_ALPHA = string.ascii_lowercase + string.digits
+
+# First line of compose files generated from the current template, these
+# never need the legacy image migrations in start_project()
+_COMPOSE_MARKER = b'# schema_version: 2\n'
+
+# Service probes connect to the IPv4 loopback address directly, the
+# AF_INET 'localhost' lookup resolves to it anyway but costs a resolver call
+_PROBE_HOST = '127.0.0.1'
+
+# Preferred host port of each service, new projects get the first free port from here
+_BASE_PORTS = types.MappingProxyType({
+    "studio": 3000,
+    "kong": 8000,
+    "auth": 9999,
+    "rest": 3001,
+    "realtime": 4000,
+    "storage": 5000,
+    "meta": 8080,
+    "functions": 54321,
+    "analytics": 4001,
+    "vector": 9001
+})
+
+_MACHINE_SIZES = ("small", "medium", "large", "xlarge")
+
+# Without OpenSSL, hashlib falls back to the much slower builtin SHA-256
+if hashlib.sha256.__name__ != 'openssl_sha256':
+    logging.getLogger(__name__).warning(
+        "hashlib is not using OpenSSL, JWT signing will use the builtin SHA-256")
+
+# Every key we issue uses the same HS256 header, so encode it once
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+def _encode_hs256(payload, mac):
+    """Encode and sign a JWT with HMAC-SHA256, byte-for-byte what jwt.encode produces.
+    mac is an HMAC already keyed with the secret, it is copied rather than consumed.
+    """
+    signing_input = _JWT_HEADER_B64 + b'.' + _b64url(json.dumps(payload, separators=(',', ':')).encode())
+    mac = mac.copy()
+    mac.update(signing_input)
+    signature = _b64url(mac.digest())
+    return (signing_input + b'.' + signature).decode('ascii')
+
+# (epoch second, "HH:MM:SS") of the last formatted log timestamp
+_ts_cache = (0, "")
+
+def _log_timestamp():
+    """Return the current time as HH:MM:SS, formatting at most once per second"""
+    global _ts_cache
+    now = int(time.time())
+    second, text = _ts_cache
+    if now != second:
+        text = time.strftime("%H:%M:%S", time.localtime(now))
+        _ts_cache = (now, text)
+    return text
+
+# Console output of every ProjectLogger is handed to one writer thread so
+# logging never blocks the caller on stdout
+_console_queue = queue.Queue()
+_console_writer = None
+_console_writer_lock = threading.Lock()
+
+def _drain_console():
+    while True:
+        entry = _console_queue.get()
+        try:
+            sys.stdout.write(entry + "\n")
+        except Exception:
+            pass
+        finally:
+            _console_queue.task_done()
+
+def _ensure_console_writer():
+    """Start the console writer thread the first time a logger is created"""
+    global _console_writer
+    with _console_writer_lock:
+        if _console_writer is None:
+            _console_writer = threading.Thread(target=_drain_console, daemon=True)
+            _console_writer.start()
+            atexit.register(_console_queue.join)
+
 class ProjectLogger:
     def __init__(self):
-        self.logs = []
+        # Keep only the most recent entries so long-running processes stay bounded
+        self.logs = collections.deque(maxlen=int(os.environ.get('SUPABASE_LOG_CAP', 10000)))
+        # Only guards snapshots and clearing; producers never take it
         self.lock = threading.Lock()
+        _ensure_console_writer()
     
     def log(self, message, level="INFO"):
-        with self.lock:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            log_entry = f"[{timestamp}] {level}: {message}"
-            self.logs.append(log_entry)
-            print(log_entry)  # Also print to console
+        log_entry = f"[{_log_timestamp()}] {level}: {message}"
+        self.logs.append(log_entry)
+        _console_queue.put(log_entry)  # Also print to console
+        if level == "ERROR":
+            # Errors usually precede an exception, get them out first
+            self.flush()
+    
+    def flush(self):
+        """Block until every queued entry has been written to the console"""
+        _console_queue.join()
     
     def get_logs(self):
         with self.lock:
-            return self.logs.copy()
+            return list(self.logs)
     
     def clear_logs(self):
         with self.lock:
             self.logs.clear()
 
+@functools.lru_cache(maxsize=4)
+def _load_templates(template_dir):
+    """Set up the Jinja2 environment for template_dir and compile the project file
+    templates, once per process. Returns (env, compose template, kong template)
+    """
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True
+    )
+    return env, env.get_template('docker-compose.yml.j2'), env.get_template('kong.yml.j2')
+
 class SupabaseProjectGenerator:
     def __init__(self):
         # Use a directory in workspace or home that we have permissions for
         self.projects_dir = os.environ.get('SUPABASE_PROJECTS_DIR', 
                                           os.path.join(os.path.expanduser('~'), 'supabase_projects'))
-        self.template_dir = "/workspace/templates"
+        self.template_dir = os.path.normpath(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'templates'))
         self.logger = ProjectLogger()
+        # Configuration of the most recent create_project() call
+        self.last_config = None
+        # get_machine_ip() result and when it was looked up
+        self._cached_ip = None
+        self._ip_ts = 0
+        # Resolved once, _run_compose would otherwise walk PATH on every call
+        self._docker = shutil.which('docker')
+        self._docker_compose = shutil.which('docker-compose')
+        # {project_name: monotonic time its compose file was last seen}
+        self._project_cache = {}
         
         # Ensure projects directory exists
         os.makedirs(self.projects_dir, exist_ok=True)
         
-        # Setup Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(self.template_dir),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        # Jinja2 environment and compiled templates, shared by every generator
+        self.jinja_env, self._compose_tpl, self._kong_tpl = _load_templates(self.template_dir)
         
     def get_machine_ip(self):
-        """Get the machine's IP address"""
+        """Get the machine's IP address, cached for a minute"""
+        if self._cached_ip and time.monotonic() - self._ip_ts < 60:
+            return self._cached_ip
         try:
             # Connect to a remote address to determine local IP
             with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
                 s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
+                ip = s.getsockname()[0]
         except:
             return "127.0.0.1"
+        self._cached_ip, self._ip_ts = ip, time.monotonic()
+        return ip
     
     def check_port_availability(self, port):
         """Check if a port is available"""
@@ -75,128 +211,189 @@ class SupabaseProjectGenerator:
         except OSError:
             return False
     
+    def _ports_in_use(self):
+        """Return the set of local TCP ports in use, read from /proc/net.
+        Returns None when the kernel tables can't be read.
+        """
+        used = set()
+        found = False
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table) as f:
+                    next(f)  # header line
+                    for line in f:
+                        # local_address is "HEXIP:HEXPORT"
+                        used.add(int(line.split()[1].rsplit(':', 1)[1], 16))
+                found = True
+            except OSError:
+                continue
+        return used if found else None
+    
+    def _probe(self, service, base_port, is_available):
+        """Return (service, first available port at or above base_port)"""
+        port = base_port
+        while not is_available(port):
+            port += 1
+            if port > base_port + 100:  # Prevent infinite loop
+                raise Exception(f"Could not find available port for {service} service")
+        return service, port
+    
     def find_available_ports(self, base_ports):
         """Find available ports starting from base ports"""
-        available_ports = {}
-        for service, base_port in base_ports.items():
-            port = base_port
-            while not self.check_port_availability(port):
-                port += 1
-                if port > base_port + 100:  # Prevent infinite loop
-                    raise Exception(f"Could not find available port for {service} service")
-            available_ports[service] = port
-        return available_ports
+        # On Linux one pass over the kernel's socket tables replaces a
+        # socket/bind/close round trip per candidate port
+        in_use = self._ports_in_use() if sys.platform.startswith('linux') else None
+        if in_use is not None:
+            return dict(self._probe(service, base_port, lambda port: port not in in_use)
+                        for service, base_port in base_ports.items())
+        
+        # Bind probes on different ports are independent, run them side by side
+        with ThreadPoolExecutor(max_workers=max(len(base_ports), 1)) as executor:
+            return dict(executor.map(
+                lambda item: self._probe(*item, self.check_port_availability),
+                base_ports.items()
+            ))
     
     def get_service_status(self, port):
         """Check if a service is running on a specific port"""
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.settimeout(1)
-                result = s.connect_ex(('localhost', port))
+                result = s.connect_ex((_PROBE_HOST, port))
                 return result == 0
         except:
             return False
 
-    def generate_jwt_keys(self, project_ref):
+    def get_service_statuses(self, ports: dict) -> dict:
+        """Check many service ports at once, within a single 1 second timeout.
+        Returns {service: is_running}
+        """
+        statuses = dict.fromkeys(ports, False)
+        pending = {}
+        # epoll/kqueue where available, select() fails once descriptors pass FD_SETSIZE
+        sel = selectors.DefaultSelector()
+        try:
+            for service, port in ports.items():
+                s = None
+                try:
+                    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    s.setblocking(False)
+                    result = s.connect_ex((_PROBE_HOST, int(port)))
+                    if result in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        sel.register(s, selectors.EVENT_WRITE, service)
+                        pending[s] = service
+                        continue
+                    # Loopback connects often complete (or fail) immediately
+                    statuses[service] = result == 0
+                except Exception:
+                    # A bad port (e.g. above 65535) only marks its own service down
+                    pass
+                if s is not None:
+                    s.close()
+            deadline = time.monotonic() + 1
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = sel.select(remaining)
+                if not events:
+                    break
+                for key, _ in events:
+                    s = key.fileobj
+                    sel.unregister(s)
+                    del pending[s]
+                    statuses[key.data] = s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                    s.close()
+        except Exception:
+            pass
+        finally:
+            for s in pending:
+                s.close()
+            sel.close()
+        return statuses
+
+    def generate_jwt_keys(self, project_ref=None):
         """Generate proper JWT tokens for Supabase anon and service keys matching Supabase format"""
         # Create a secret key for signing (64 characters for stronger security)
         secret_key = secrets.token_urlsafe(48)
         
         # Generate a random project reference if not provided
         if not project_ref:
-            project_ref = secrets.token_urlsafe(16).lower().replace('_', '').replace('-', '')[:20]
+            project_ref = ''.join(secrets.choice(_REF_ALPHA) for _ in range(20))
         
         # Current timestamp
         current_time = int(datetime.now().timestamp())
         # 10 year expiry (matching Supabase standard)
         expiry_time = current_time + (365 * 24 * 60 * 60 * 10)
         
-        # Anon key payload (exactly matching your example format)
-        anon_payload = {
-            "iss": "supabase",
-            "ref": project_ref,
-            "role": "anon", 
-            "iat": current_time,
-            "exp": expiry_time
-        }
-        
-        # Service key payload (exactly matching your example format)
-        service_payload = {
+        # Both keys share everything but the role (exactly matching your example format)
+        payload = {
             "iss": "supabase",
             "ref": project_ref,
-            "role": "service_role",
+            "role": "anon",
             "iat": current_time,
             "exp": expiry_time
         }
+        # Key the HMAC once, both tokens sign with copies of it
+        mac = hmac.new(secret_key.encode(), digestmod='sha256')
         
         # Generate tokens with HS256 algorithm
-        anon_key = jwt.encode(anon_payload, secret_key, algorithm="HS256")
-        service_key = jwt.encode(service_payload, secret_key, algorithm="HS256")
+        anon_key = _encode_hs256(payload, mac)
+        payload["role"] = "service_role"
+        service_key = _encode_hs256(payload, mac)
         
-        return anon_key, service_key, secret_key
+        return anon_key, service_key, secret_key, project_ref
     
-    def create_project(self, project_name, machine_size, specs, db_host="192.168.1.43", db_port="5432", db_user="postgres", db_password="postgres", username=None, password=None, use_local_db=False):
-        """Create a new Supabase project with specified parameters"""
-        self.logger.clear_logs()  # Clear previous logs
-        self.logger.log(f"Starting Supabase project creation: {project_name}")
-        
-        # Validate project name uniqueness
-        self.logger.log("Validating project name uniqueness...")
-        project_path = os.path.join(self.projects_dir, project_name)
-        if os.path.exists(project_path):
-            self.logger.log(f"Project '{project_name}' already exists!", "ERROR")
-            raise ValueError(f"Project '{project_name}' already exists. Please choose a different name.")
+    def create_project(self, project_name, machine_size, specs, db_host="192.168.1.43", db_port="5432", db_user="postgres", db_password="postgres", username=None, password=None, use_local_db=False, logger=None):
+        """Create a new Supabase project with specified parameters.
+        Progress goes to logger, or to self.logger (cleared first) when none is given.
+        """
+        if logger is None:
+            logger = self.logger
+            logger.clear_logs()  # Clear previous logs
+        logger.log(f"Starting Supabase project creation: {project_name}")
         
         # Validate machine size
-        self.logger.log("Validating machine size configuration...")
-        valid_machine_sizes = ["small", "medium", "large", "xlarge"]
-        if machine_size not in valid_machine_sizes:
-            self.logger.log(f"Invalid machine size: {machine_size}", "ERROR")
-            raise ValueError(f"Invalid machine size. Choose from: {', '.join(valid_machine_sizes)}")
+        logger.log("Validating machine size configuration...")
+        if machine_size not in _MACHINE_SIZES:
+            logger.log(f"Invalid machine size: {machine_size}", "ERROR")
+            raise ValueError(f"Invalid machine size. Choose from: {', '.join(_MACHINE_SIZES)}")
         
         # Verify PostgreSQL connection
-        self.logger.log(f"Using hosted PostgreSQL server at {db_host}:{db_port}")
-        self.logger.log("⚠️  NOT using any local PostgreSQL installation")
+        logger.log(f"Using hosted PostgreSQL server at {db_host}:{db_port}")
+        logger.log("⚠️  NOT using any local PostgreSQL installation")
         
-        # Create project directory
-        self.logger.log(f"Creating project directory: {project_path}")
-        os.makedirs(project_path, exist_ok=True)
+        # Validate project name uniqueness by creating its directory, one syscall
+        # that also stops two concurrent creates from claiming the same name
+        logger.log("Validating project name uniqueness...")
+        project_path = os.path.join(self.projects_dir, project_name)
+        try:
+            Path(project_path).mkdir(parents=True)
+        except FileExistsError:
+            logger.log(f"Project '{project_name}' already exists!", "ERROR")
+            raise ValueError(f"Project '{project_name}' already exists. Please choose a different name.")
+        logger.log(f"Created project directory: {project_path}")
         
         # Generate JWT keys with project reference
-        self.logger.log("Generating Supabase-compatible JWT tokens...")
-        project_ref = secrets.token_urlsafe(16).lower().replace('_', '').replace('-', '')[:20]
-        anon_key, service_key, jwt_secret = self.generate_jwt_keys(project_ref)
-        self.logger.log(f"Generated project reference: {project_ref}")
-        self.logger.log("✅ JWT tokens generated successfully")
+        logger.log("Generating Supabase-compatible JWT tokens...")
+        anon_key, service_key, jwt_secret, project_ref = self.generate_jwt_keys()
+        logger.log(f"Generated project reference: {project_ref}")
+        logger.log("✅ JWT tokens generated successfully")
         
         # Get machine IP
-        self.logger.log("Detecting machine IP address...")
+        logger.log("Detecting machine IP address...")
         machine_ip = self.get_machine_ip()
-        self.logger.log(f"Machine IP detected: {machine_ip}")
-        
-        # Define base ports for services
-        self.logger.log("Checking port availability for Supabase services...")
-        base_ports = {
-            "studio": 3000,
-            "kong": 8000,
-            "auth": 9999,
-            "rest": 3001,
-            "realtime": 4000,
-            "storage": 5000,
-            "meta": 8080,
-            "functions": 54321,
-            "analytics": 4001,
-            "vector": 9001
-        }
+        logger.log(f"Machine IP detected: {machine_ip}")
         
+        logger.log("Checking port availability for Supabase services...")
         # Find available ports
         try:
-            available_ports = self.find_available_ports(base_ports)
-            self.logger.log("✅ Port allocation completed:")
+            available_ports = self.find_available_ports(_BASE_PORTS)
+            logger.log("✅ Port allocation completed:")
             for service, port in available_ports.items():
-                self.logger.log(f"  • {service.title()}: {port}")
+                logger.log(f"  • {service.title()}: {port}")
         except Exception as e:
-            self.logger.log(f"Port allocation failed: {str(e)}", "ERROR")
+            logger.log(f"Port allocation failed: {str(e)}", "ERROR")
             raise ValueError(f"Port allocation failed: {str(e)}")
         
         # Create database configuration
@@ -209,7 +406,7 @@ class SupabaseProjectGenerator:
         }
         
         # Create project configuration
-        self.logger.log("Creating project configuration...")
+        logger.log("Creating project configuration...")
         config = {
             "project_name": project_name,
             "project_ref": project_ref,
@@ -224,58 +421,81 @@ class SupabaseProjectGenerator:
             "ports": available_ports
         }
         
-        # Save configuration
-        self.logger.log("Saving project configuration...")
-        config_path = os.path.join(project_path, "supabase_config.json")
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-        
         # Create docker-compose.yml for the project
-        self.logger.log("Generating Docker Compose configuration...")
+        logger.log("Generating Docker Compose configuration...")
         self.create_docker_compose(project_path, project_name, config)
+        self._project_cache[project_name] = time.monotonic()
         
-        self.logger.log("✅ Supabase project created successfully!")
+        # Save configuration
+        logger.log("Saving project configuration...")
+        config_path = os.path.join(project_path, "supabase_config.json")
+        Path(config_path).write_bytes(json.dumps(config, indent=2).encode())
+        self.last_config = config
+        
+        logger.log("✅ Supabase project created successfully!")
         
         # Auto-start the project after creation
-        self.logger.log("🚀 Starting project services...")
+        logger.log("🚀 Starting project services...")
         if self.start_project(project_name):
-            self.logger.log("✅ Project services started successfully!")
+            logger.log("✅ Project services started successfully!")
         else:
-            self.logger.log("⚠️ Warning: Failed to start some services automatically")
+            logger.log("⚠️ Warning: Failed to start some services automatically")
         
-        self.logger.log(f"📁 Project location: {project_path}")
-        self.logger.log(f"🌐 Supabase Studio will be available at: http://{machine_ip}:{available_ports['studio']}")
-        self.logger.log(f"🔌 API Gateway (Kong) at: http://{machine_ip}:{available_ports['kong']}")
+        logger.log(f"📁 Project location: {project_path}")
+        logger.log(f"🌐 Supabase Studio will be available at: http://{machine_ip}:{available_ports['studio']}")
+        logger.log(f"🔌 API Gateway (Kong) at: http://{machine_ip}:{available_ports['kong']}")
         
+        logger.flush()
         print(f"Supabase project '{project_name}' created successfully at {project_path}")
         return project_path
 
+    def _locate_project(self, project_name, need_compose=True):
+        """Find a project's directory, checking the filesystem at most once a second.
+        Returns (project_path, error), error is None when the project is usable.
+        """
+        project_path = os.path.join(self.projects_dir, project_name)
+        seen = self._project_cache.get(project_name)
+        if seen is not None and time.monotonic() - seen < 1:
+            return (project_path, None)
+        # One stat covers the usual case, the directory is only checked when the compose file is missing
+        try:
+            os.stat(os.path.join(project_path, 'docker-compose.yml'))
+        except (FileNotFoundError, NotADirectoryError):
+            if not os.access(project_path, os.F_OK):
+                return (project_path, f"Project path not found: {project_path}")
+            if need_compose:
+                return (project_path, "docker-compose.yml not found")
+            return (project_path, None)
+        # Only positive results are cached, a missing project is rechecked every time
+        self._project_cache[project_name] = time.monotonic()
+        return (project_path, None)
+
     def start_project(self, project_name):
         """Start a Supabase project using Docker Compose.
         Returns (success, stdout, stderr)
         """
         try:
-            project_path = os.path.join(self.projects_dir, project_name)
-            if not os.path.exists(project_path):
-                return (False, '', f"Project path not found: {project_path}")
-            
-            compose_file = os.path.join(project_path, 'docker-compose.yml')
-            if not os.path.exists(compose_file):
-                return (False, '', "docker-compose.yml not found")
+            project_path, error = self._locate_project(project_name)
+            if error:
+                return (False, '', error)
             
             # Auto-migrate GoTrue image tag if old 'latest' is present
+            compose_file = os.path.join(project_path, 'docker-compose.yml')
             try:
-                with open(compose_file, 'r') as f:
-                    compose_text = f.read()
-                if 'supabase/gotrue:latest' in compose_text:
-                    compose_text = compose_text.replace('supabase/gotrue:latest', 'supabase/gotrue:v2')
-                    with open(compose_file, 'w') as f:
-                        f.write(compose_text)
+                with open(compose_file, 'rb') as f:
+                    # Legacy files only, probe them without reading them in
+                    if f.readline() != _COMPOSE_MARKER:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            needs_migration = mm.find(b'supabase/gotrue:latest') != -1
+                        if needs_migration:
+                            f.seek(0)
+                            compose_text = f.read().replace(b'supabase/gotrue:latest', b'supabase/gotrue:v2')
+                            Path(compose_file).write_bytes(compose_text)
             except Exception:
                 pass
 
             # Pull latest images (non-fatal)
-            self._run_compose(project_path, ['pull'])
+            self._run_compose(project_path, ['pull'], capture=False)
             # Start services
             rc, out, err = self._run_compose(project_path, ['up', '-d'])
             return (rc == 0, out, err)
@@ -289,13 +509,9 @@ class SupabaseProjectGenerator:
         Returns (success, stdout, stderr)
         """
         try:
-            project_path = os.path.join(self.projects_dir, project_name)
-            if not os.path.exists(project_path):
-                return (False, '', f"Project path not found: {project_path}")
-            
-            compose_file = os.path.join(project_path, 'docker-compose.yml')
-            if not os.path.exists(compose_file):
-                return (False, '', "docker-compose.yml not found")
+            project_path, error = self._locate_project(project_name)
+            if error:
+                return (False, '', error)
             
             rc, out, err = self._run_compose(project_path, ['down'])
             return (rc == 0, out, err)
@@ -309,9 +525,9 @@ class SupabaseProjectGenerator:
         Returns (success, stdout, stderr)
         """
         try:
-            project_path = os.path.join(self.projects_dir, project_name)
-            if not os.path.exists(project_path):
-                return (False, '', f"Project path not found: {project_path}")
+            project_path, error = self._locate_project(project_name, need_compose=False)
+            if error:
+                return (False, '', error)
             
             # First stop the project if it's running (ignore errors)
             self.stop_project(project_name)
@@ -319,9 +535,16 @@ class SupabaseProjectGenerator:
             # Remove docker containers and volumes
             rc, out1, err1 = self._run_compose(project_path, ['down', '-v', '--remove-orphans'])
             # Attempt to delete project directory regardless of rc from compose
+            self._project_cache.pop(project_name, None)
             try:
-                import shutil
-                shutil.rmtree(project_path)
+                if os.name == 'posix':
+                    # coreutils rm walks large trees (storage volumes) faster than rmtree
+                    res = subprocess.run(['rm', '-rf', '--', project_path],
+                                         stderr=subprocess.PIPE, text=True)
+                    if res.returncode != 0:
+                        raise OSError(res.stderr.strip() or f"rm exited with status {res.returncode}")
+                else:
+                    shutil.rmtree(project_path)
                 out2, err2 = 'project directory removed', ''
             except Exception as e:
                 out2, err2 = '', f"failed to remove project directory: {e}"
@@ -334,28 +557,34 @@ class SupabaseProjectGenerator:
             print(msg)
             return (False, '', msg)
 
-    def _run_compose(self, cwd, args):
+    def _run_compose(self, cwd, args, capture=True):
         """Run docker compose with fallback to old/new syntax.
+        With capture=False stdout is discarded and returned as ''.
         Returns (returncode, stdout, stderr).
         """
-        import shutil
-        import subprocess
         commands = []
         # Prefer docker compose if available
-        if shutil.which('docker'):
-            commands.append(['docker', 'compose'] + args)
+        if self._docker:
+            commands.append([self._docker, 'compose'] + args)
         # Fallback to docker-compose
-        if shutil.which('docker-compose'):
-            commands.append(['docker-compose'] + args)
+        if self._docker_compose:
+            commands.append([self._docker_compose] + args)
         if not commands:
             return (1, '', 'docker/docker-compose not found')
         last_rc, last_out, last_err = 1, '', ''
         for cmd in commands:
             try:
-                res = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-                if res.returncode == 0:
-                    return (0, res.stdout, res.stderr)
-                last_rc, last_out, last_err = res.returncode, res.stdout, res.stderr
+                # communicate() drains both pipes together as raw bytes,
+                # so they are only decoded once the command has finished
+                with subprocess.Popen(cmd, cwd=cwd,
+                                      stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                                      stderr=subprocess.PIPE) as proc:
+                    out, err = proc.communicate()
+                out = out.decode(errors='replace') if out else ''
+                err = err.decode(errors='replace')
+                if proc.returncode == 0:
+                    return (0, out, err)
+                last_rc, last_out, last_err = proc.returncode, out, err
             except Exception as e:
                 last_rc, last_err = 1, str(e)
         return (last_rc, last_out, last_err)
@@ -371,261 +600,30 @@ class SupabaseProjectGenerator:
     
     def create_docker_compose(self, project_path, project_name, config):
         """Create docker-compose.yml for the Supabase project"""
-        ports = config['ports']
-        docker_compose_content = f"""
-version: '3.8'
-
-services:
-  studio:
-    image: supabase/studio:latest
-    ports:
-      - {ports['studio']}:3000
-    environment:
-      SUPABASE_URL: http://kong:{ports['kong']}
-      SUPABASE_REST_URL: http://localhost:{ports['kong']}/rest/v1/
-      SUPABASE_ANON_KEY: {config['anon_key']}
-      SUPABASE_SERVICE_KEY: {config['service_key']}
-      STUDIO_PG_META_URL: http://meta:{ports['meta']}
-    
-  kong:
-    image: kong:latest
-    ports:
-      - {ports['kong']}:8000
-    environment:
-      KONG_DATABASE: off
-      KONG_DECLARATIVE_CONFIG: /opt/kong/kong.yml
-      KONG_DNS_ORDER: LAST,A,CNAME
-      KONG_PLUGINS: request-transformer,cors,key-auth,acl,opentelemetry
-    volumes:
-      - ./kong.yml:/opt/kong/kong.yml
-    healthcheck:
-      test: ["CMD", "kong", "health"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  auth:
-    image: supabase/gotrue:v2
-    ports:
-      - {ports['auth']}:9999
-    environment:
-      GOTRUE_API_HOST: 0.0.0.0
-      GOTRUE_API_PORT: 9999
-      API_EXTERNAL_URL: http://localhost:{ports['kong']}
-      
-      GOTRUE_DB_DRIVER: postgres
-      GOTRUE_DB_DATABASE_URL: postgresql://{config['db_config']['user']}:{config['db_config']['password']}@{config['db_config']['host']}:{config['db_config']['port']}/{project_name}
-      
-      GOTRUE_SITE_URL: http://localhost:{ports['studio']}
-      GOTRUE_URI_ALLOW_LIST: '*'
-      GOTRUE_DISABLE_SIGNUP: false
-      
-      GOTRUE_JWT_ADMIN_ROLES: service_role
-      GOTRUE_JWT_AUD: authenticated
-      GOTRUE_JWT_DEFAULT_GROUP_NAME: authenticated
-      GOTRUE_JWT_EXP: 3600
-      GOTRUE_JWT_SECRET: {config['jwt_secret']}
-      
-      GOTRUE_EXTERNAL_EMAIL_ENABLED: true
-      GOTRUE_MAILER_AUTOCONFIRM: true
-      GOTRUE_SMTP_HOST: localhost
-      GOTRUE_SMTP_PORT: 2500
-      GOTRUE_SMTP_USER: ""
-      GOTRUE_SMTP_PASS: ""
-      GOTRUE_SMTP_ADMIN_EMAIL: admin@example.com
-      GOTRUE_MAILER_URLPATHS_INVITE: /auth/v1/verify
-      GOTRUE_MAILER_URLPATHS_CONFIRMATION: /auth/v1/verify
-      GOTRUE_MAILER_URLPATHS_RECOVERY: /auth/v1/verify
-      GOTRUE_MAILER_URLPATHS_EMAIL_CHANGE: /auth/v1/verify
-    healthcheck:
-      test: ["CMD", "wget", "--quiet", "--tries=1", "--spider", "http://localhost:9999/health"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  rest:
-    image: postgrest/postgrest:latest
-    ports:
-      - {ports['rest']}:3000
-    environment:
-      PGRST_DB_URI: postgresql://{config['db_config']['user']}:{config['db_config']['password']}@{config['db_config']['host']}:{config['db_config']['port']}/{project_name}
-      PGRST_DB_SCHEMA: public
-      PGRST_DB_ANON_ROLE: anon
-      PGRST_JWT_SECRET: {config['jwt_secret']}
-    healthcheck:
-      test: ["CMD", "wget", "--quiet", "--tries=1", "--spider", "http://localhost:3000/"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  realtime:
-    image: supabase/realtime:latest
-    ports:
-      - {ports['realtime']}:4000
-    environment:
-      PORT: 4000
-      DB_HOST: {config['db_config']['host']}
-      DB_PORT: {config['db_config']['port']}
-      DB_NAME: {project_name}
-      DB_USER: {config['db_config']['user']}
-      DB_PASSWORD: {config['db_config']['password']}
-      DB_SSL: 'false'
-      JWT_SECRET: {config['jwt_secret']}
-      REPLICATION_MODE: RLS
-      REPLICATION_POLL_INTERVAL: 100
-      SECURE_CHANNELS: 'true'
-      SLOT_NAME: supabase_realtime_rls
-      TEMPORARY_SLOT: 'true'
-    healthcheck:
-      test: ["CMD", "curl", "-f", "http://localhost:4000/api/health"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  storage:
-    image: supabase/storage-api:latest
-    ports:
-      - {ports['storage']}:5000
-    environment:
-      ANON_KEY: {config['anon_key']}
-      SERVICE_KEY: {config['service_key']}
-      POSTGREST_URL: http://rest:3000
-      PGRST_JWT_SECRET: {config['jwt_secret']}
-      DATABASE_URL: postgresql://{config['db_config']['user']}:{config['db_config']['password']}@{config['db_config']['host']}:{config['db_config']['port']}/{project_name}
-      FILE_SIZE_LIMIT: 52428800
-      STORAGE_BACKEND: file
-      FILE_STORAGE_BACKEND_PATH: /var/lib/storage
-      TENANT_ID: stub
-      SKIP_API_HOST_CHECK: true
-      REGION: stub
-    volumes:
-      - ./storage:/var/lib/storage
-    healthcheck:
-      test: ["CMD", "wget", "--quiet", "--tries=1", "--spider", "http://localhost:5000/status"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  meta:
-    image: supabase/postgres-meta:latest
-    ports:
-      - {ports['meta']}:8080
-    environment:
-      PG_META_PORT: 8080
-      PG_META_DB_HOST: {config['db_config']['host']}
-      PG_META_DB_PORT: {config['db_config']['port']}
-      PG_META_DB_NAME: {project_name}
-      PG_META_DB_USER: {config['db_config']['user']}
-      PG_META_DB_PASSWORD: {config['db_config']['password']}
-    healthcheck:
-      test: ["CMD", "wget", "--quiet", "--tries=1", "--spider", "http://localhost:8080/health"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  functions:
-    image: supabase/edge-runtime:latest
-    ports:
-      - {ports['functions']}:8081
-    environment:
-      SUPABASE_URL: http://kong:{ports['kong']}
-      SUPABASE_ANON_KEY: {config['anon_key']}
-      SUPABASE_SERVICE_KEY: {config['service_key']}
-      SUPABASE_DB_URL: postgresql://{config['db_config']['user']}:{config['db_config']['password']}@{config['db_config']['host']}:{config['db_config']['port']}/{project_name}
-    volumes:
-      - ./functions:/home/deno/functions:Z
-    healthcheck:
-      test: ["CMD", "curl", "-f", "http://localhost:8081/status"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  analytics:
-    image: supabase/logflare:latest
-    ports:
-      - {ports['analytics']}:4000
-    environment:
-      LOGFLARE_NODE_HOST: 127.0.0.1
-      DB_HOST: {config['db_config']['host']}
-      DB_PORT: {config['db_config']['port']}
-      DB_NAME: {project_name}
-      DB_USER: {config['db_config']['user']}
-      DB_PASSWORD: {config['db_config']['password']}
-      LOGFLARE_API_KEY: {config['jwt_secret']}
-      LOGFLARE_SINGLE_TENANT: true
-      LOGFLARE_SUPABASE_MODE: true
-    healthcheck:
-      test: ["CMD", "curl", "-f", "http://localhost:4000/health"]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    
-  vector:
-    image: timberio/vector:latest
-    ports:
-      - {ports['vector']}:9001
-    
-volumes:
-  storage:
-"""
+        db = config['db_config']
+        docker_compose_content = self._compose_tpl.render(
+            project_name=project_name,
+            ports=config['ports'],
+            db_config=db,
+            # Used by four services, build it once instead of in each
+            db_url=f"postgresql://{db['user']}:{db['password']}@{db['host']}:{db['port']}/{project_name}",
+            anon_key=config['anon_key'],
+            service_key=config['service_key'],
+            jwt_secret=config['jwt_secret']
+        )
         
         docker_compose_path = os.path.join(project_path, "docker-compose.yml")
-        with open(docker_compose_path, 'w') as f:
-            f.write(docker_compose_content)
+        Path(docker_compose_path).write_bytes(docker_compose_content.encode('utf-8'))
         
         # Create Kong configuration
         self.create_kong_config(project_path, config)
     
     def create_kong_config(self, project_path, config):
         """Create Kong configuration file"""
-        kong_content = f"""
-_format_version: "1.1"
-
-services:
-  - name: auth-v1
-    url: http://auth:9999/verify
-    routes:
-      - name: auth-v1-routes
-        paths:
-          - /auth/v1/*
-        strip_path: true
-    
-  - name: rest-v1
-    url: http://rest:3000/
-    routes:
-      - name: rest-v1-routes
-        paths:
-          - /rest/v1/*
-        strip_path: true
-    
-  - name: realtime-v1
-    url: http://realtime:4000/socket/
-    routes:
-      - name: realtime-v1-routes
-        paths:
-          - /realtime/v1/*
-        strip_path: true
-    
-  - name: storage-v1
-    url: http://storage:5000/
-    routes:
-      - name: storage-v1-routes
-        paths:
-          - /storage/v1/*
-        strip_path: true
-    
-  - name: functions-v1
-    url: http://functions:8081/
-    routes:
-      - name: functions-v1-routes
-        paths:
-          - /functions/v1/*
-        strip_path: true
-"""
+        kong_content = self._kong_tpl.render()
         
         kong_path = os.path.join(project_path, "kong.yml")
-        with open(kong_path, 'w') as f:
-            f.write(kong_content)
+        Path(kong_path).write_bytes(kong_content.encode('utf-8'))
     
     def bootstrap_project(self, project_path):
         """Bootstrap the project by running docker-compose up and ensuring containers are healthy"""
@@ -682,6 +680,12 @@ services:
 
     def run_locally(self, project_name):
         """Run Supabase services locally without Docker"""
+        if psycopg2 is None:
+            return {
+                'success': False,
+                'message': 'psycopg2 not installed',
+                'output': 'Install psycopg2 to check the local PostgreSQL connection'
+            }
         try:
             project_path = os.path.join(self.projects_dir, project_name)
             config_path = os.path.join(project_path, "supabase_config.json")
@@ -691,7 +695,6 @@ services:
                 config = json.load(f)
             
             # Check if PostgreSQL is running locally
-            import psycopg2
             try:
                 conn = psycopg2.connect(
                     host=config['db_config']['host'],
@@ -2,149 +2,389 @@
 
 import sys
 import os
-import json
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+import re
+import time
+import uuid
+import stat
+import asyncio
+import functools
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from quart import Quart, render_template, request, redirect, url_for, flash, jsonify, make_response
+from quart.json.provider import DefaultJSONProvider
+from jinja2 import BytecodeCache, FileSystemBytecodeCache
+from markupsafe import Markup
+
+# Debugger, reloader and template reloading are opt-in with FLASK_DEBUG=true
+_DEBUG = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
+
+# Serialize API responses with orjson when it is available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add the parent directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-# Now we can import the SupabaseProjectGenerator
-from src.core.main import SupabaseProjectGenerator
+# src.core.main (psutil, the project templates) is imported along with the
+# generator on first use, importing the app itself stays light
+from src.core.config import load_config
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        # response() asks for indentation in debug mode
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-app = Flask(__name__, template_folder='templates')
+app = Quart(__name__, template_folder='templates')
 app.secret_key = 'your-secret-key-change-in-production'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+def _private_dir(path):
+    """Create path as a 0700 directory, refusing one owned by another user or open to others.
+    Cached bytecode is executed when loaded, so nobody else may be able to write it.
+    """
+    os.makedirs(path, mode=stat.S_IRWXU, exist_ok=True)
+    st = os.lstat(path)
+    if os.name == 'posix' and (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid()
+                               or stat.S_IMODE(st.st_mode) & (stat.S_IRWXG | stat.S_IRWXO)):
+        raise RuntimeError(f"Refusing template cache directory {path}: it must be a directory "
+                           "owned by this user with mode 0700")
+    return path
+
+class _LazyBytecodeCache(BytecodeCache):
+    """FileSystemBytecodeCache whose directory is set up on the first template compile"""
+    
+    @functools.cached_property
+    def _cache(self):
+        directory = os.environ.get('SUPABASE_JINJA_CACHE_DIR')
+        if directory is None:
+            # Jinja's default, a per-user 0700 directory whose ownership it checks
+            return FileSystemBytecodeCache()
+        return FileSystemBytecodeCache(_private_dir(directory))
+    
+    def load_bytecode(self, bucket):
+        self._cache.load_bytecode(bucket)
+    
+    def dump_bytecode(self, bucket):
+        self._cache.dump_bytecode(bucket)
+    
+    def clear(self):
+        self._cache.clear()
+
+# Compiled templates are kept on disk so restarts and extra workers skip
+# compiling them again; outside debug they are never re-checked for edits
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': _LazyBytecodeCache()}
+app.config['TEMPLATES_AUTO_RELOAD'] = _DEBUG
+
+# Shared by every request: each creation job passes its own logger, so the
+# generator only holds caches that are safe to share
+_generator = None
+
+def get_generator():
+    """The process-wide SupabaseProjectGenerator, created on first use"""
+    global _generator
+    if _generator is None:
+        from src.core.main import SupabaseProjectGenerator
+        _generator = SupabaseProjectGenerator()
+    return _generator
+
+# Older configs stored created_at as a bytes repr, e.g. b'2024-01-01T00:00:00\n'
+_CREATED_AT_RE = re.compile(r"^b(['\"])(.*)\1$", re.DOTALL)
+
+# Port probes get their own workers so they never queue behind slow
+# docker commands in asyncio's default pool
+_probe_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='port-probe')
 
-generator = SupabaseProjectGenerator()
+# {port: (checked_at, is_running)}, only touched from the event loop thread
+_status_cache = {}
+# A service's status doesn't meaningfully change within this many seconds
+_STATUS_TTL = 2.0
+
+_DOCKER = shutil.which('docker')
+# Host side of published ports in `docker ps` output, e.g. 0.0.0.0:8000->8000/tcp
+# or a range such as 0.0.0.0:8000-8001->8000-8001/tcp
+_PUBLISHED_PORT_RE = re.compile(r':(\d+)(?:-(\d+))?->')
+# (checked_at, published host ports or None when docker can't be asked)
+_published_cache = (0.0, None)
+
+def _published_ports():
+    """Host ports published by running containers, None if docker is unavailable"""
+    if not _DOCKER:
+        return None
+    try:
+        out = subprocess.run([_DOCKER, 'ps', '--format', '{{.Ports}}'], capture_output=True,
+                             text=True, timeout=5, check=True).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    ports = set()
+    for m in _PUBLISHED_PORT_RE.finditer(out):
+        first = int(m.group(1))
+        ports.update(range(first, int(m.group(2) or first) + 1))
+    return ports
+
+async def _bulk_statuses(port_maps):
+    """Statuses for a list of {service: port} maps, returns [{service: is_running}].
+    Every port without a recent result is probed together in one select round,
+    except ports no running container publishes, which are reported down right away.
+    """
+    global _published_cache
+    now = time.monotonic()
+    stale = {}
+    for ports in port_maps:
+        for port in ports.values():
+            hit = _status_cache.get(port)
+            if not (hit and now - hit[0] < _STATUS_TTL):
+                stale[port] = port
+    if stale:
+        loop = asyncio.get_running_loop()
+        if now - _published_cache[0] >= _STATUS_TTL:
+            _published_cache = (now, await loop.run_in_executor(_probe_pool, _published_ports))
+        published = _published_cache[1]
+        if published is not None:
+            for port in [p for p in stale if int(p) not in published]:
+                del stale[port]
+                _status_cache[port] = (now, False)
+    if stale:
+        results = await loop.run_in_executor(_probe_pool, get_generator().get_service_statuses, stale)
+        for port, running in results.items():
+            _status_cache[port] = (now, running)
+    return [{svc: _status_cache[port][1] for svc, port in ports.items()} for ports in port_maps]
+
+async def _service_statuses(ports):
+    """Probe all of a project's ports at once, returns {service: is_running}"""
+    return (await _bulk_statuses([ports]))[0]
 
 @app.route('/')
-def index():
-    return render_template('index.html')
+async def index():
+    return await render_template('index.html')
 
-@app.route('/create', methods=['POST'])
-def create_project():
+# {job_id: job}, background project creations started from /create
+_jobs = {}
+# Finished jobs are forgotten once there are more than this many
+_MAX_JOBS = 100
+
+def _job_logs(job):
+    """Log lines of a job so far"""
+    return job['logger'].get_logs()
+
+async def _run_create_job(job, params):
+    """Create, start and configure a project, recording the outcome on the job"""
+    project_name = params['project_name']
     try:
-        # Get form data
-        project_name = request.form['project_name']
-        machine_size = request.form['machine_size']
-        specs = request.form['specs']
-        username = request.form.get('username')
-        password = request.form.get('password')
-        # Use configurable database settings with environment variables fallback
-        db_host = os.environ.get('SUPABASE_DB_HOST', '192.168.1.43')
-        db_port = os.environ.get('SUPABASE_DB_PORT', '5432')
-        db_user = os.environ.get('SUPABASE_DB_USER', 'postgres')
-        db_password = os.environ.get('SUPABASE_DB_PASSWORD', 'postgres')
-        use_local_db = request.form.get('use_local_db', 'false') == 'true'
-        
-        # Validate required fields
-        if not project_name:
-            flash('Project name is required!', 'error')
-            return redirect(url_for('index'))
-        
         # Create the project
-        project_path = generator.create_project(
-            project_name=project_name,
-            machine_size=machine_size,
-            specs=specs,
-            db_host=db_host,
-            db_port=db_port,
-            db_user=db_user,
-            db_password=db_password,
-            username=username,
-            password=password,
-            use_local_db=use_local_db
-        )
+        project_path = await asyncio.to_thread(get_generator().create_project, **params, logger=job['logger'])
         
         # Auto-start the project after creation
-        start_result = generator.start_project(project_name)
+        start_result = await asyncio.to_thread(get_generator().start_project, project_name)
         
         # Load config to pass to template
         config_path = os.path.join(project_path, 'supabase_config.json')
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = load_config(config_path)
         
         # Run locally with PostgreSQL instead of Docker
-        local_result = generator.run_locally(project_name)
-        
-        # Get creation logs
-        creation_logs = generator.logger.get_logs()
+        local_result = await asyncio.to_thread(get_generator().run_locally, project_name)
         
         # Get real service status after docker-compose
-        service_status = {}
-        ports = config.get('ports', {})
-        for service, port in ports.items():
-            service_status[service] = generator.get_service_status(port)
+        service_status = await _service_statuses(config.get('ports', {}))
+        
+        job['result'] = {
+            'project_name': project_name,
+            'project_path': project_path,
+            'config': config,
+            'service_status': service_status,
+            'local_result': local_result
+        }
+        job['status'] = 'done'
+    except Exception as e:
+        job['error'] = str(e)
+        job['status'] = 'error'
+
+@app.route('/create', methods=['POST'])
+async def create_project():
+    try:
+        # Get form data
+        form = await request.form
+        project_name = form['project_name']
+        # Use configurable database settings with environment variables fallback
+        params = {
+            'project_name': project_name,
+            'machine_size': form['machine_size'],
+            'specs': form['specs'],
+            'db_host': os.environ.get('SUPABASE_DB_HOST', '192.168.1.43'),
+            'db_port': os.environ.get('SUPABASE_DB_PORT', '5432'),
+            'db_user': os.environ.get('SUPABASE_DB_USER', 'postgres'),
+            'db_password': os.environ.get('SUPABASE_DB_PASSWORD', 'postgres'),
+            'username': form.get('username'),
+            'password': form.get('password'),
+            'use_local_db': form.get('use_local_db', 'false') == 'true'
+        }
+        
+        # Validate required fields
+        if not project_name:
+            await flash('Project name is required!', 'error')
+            return redirect(url_for('index'))
         
-        flash(f'Project "{project_name}" created and Docker services started at {project_path}', 'success')
-        return render_template('success.html', 
-                             project_name=project_name, 
-                             project_path=project_path, 
-                             config=config,
-                             creation_logs=creation_logs,
-                             service_status=service_status,
-                             local_result=local_result)
+        # Creation pulls images and starts containers, run it in the background
+        # and let the page follow along through /api/jobs/<job_id>/stream
+        from src.core.main import ProjectLogger
+        job_id = uuid.uuid4().hex
+        job = {'project_name': project_name, 'status': 'running', 'logger': ProjectLogger()}
+        job['task'] = asyncio.create_task(_run_create_job(job, params))
+        _jobs[job_id] = job
+        if len(_jobs) > _MAX_JOBS:
+            for old_id in [i for i, j in _jobs.items() if j['status'] != 'running'][:len(_jobs) - _MAX_JOBS]:
+                del _jobs[old_id]
+        return await render_template('creating.html', job_id=job_id, project_name=project_name)
         
     except Exception as e:
-        flash(f'Error creating project: {str(e)}', 'error')
+        await flash(f'Error creating project: {str(e)}', 'error')
+        return redirect(url_for('index'))
+
+@app.route('/jobs/<job_id>')
+async def job_result(job_id):
+    """Page for a creation job: progress while running, then the result"""
+    job = _jobs.get(job_id)
+    if job is None:
+        await flash('Unknown or expired project creation job', 'error')
         return redirect(url_for('index'))
+    if job['status'] == 'running':
+        return await render_template('creating.html', job_id=job_id, project_name=job['project_name'])
+    if job['status'] == 'error':
+        await flash(f"Error creating project: {job['error']}", 'error')
+        return redirect(url_for('index'))
+    
+    result = job['result']
+    await flash(f'Project "{result["project_name"]}" created and Docker services started at {result["project_path"]}', 'success')
+    return await render_template('success.html', creation_logs=_job_logs(job), **result)
+
+@app.route('/api/jobs/<job_id>/stream')
+async def job_stream(job_id):
+    """Server-Sent Events stream of a creation job's log lines, ending with a 'done' event"""
+    job = _jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    # The generator runs after the request context is gone
+    result_url = url_for('job_result', job_id=job_id)
+    
+    async def events():
+        sent = 0
+        while True:
+            running = job['status'] == 'running'
+            logs = _job_logs(job)
+            for line in logs[sent:]:
+                yield f"data: {app.json.dumps({'log': line})}\n\n".encode()
+            sent = len(logs)
+            if not running:
+                yield f"event: done\ndata: {app.json.dumps({'status': job['status'], 'url': result_url})}\n\n".encode()
+                return
+            await asyncio.wait({job['task']}, timeout=0.5)
+    
+    response = await make_response(events(), {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.timeout = None
+    return response
+
+def _config_stat(project_name):
+    """(config_path, stat result or None when it doesn't exist) in a single syscall"""
+    config_path = os.path.join(get_generator().projects_dir, project_name, 'supabase_config.json')
+    try:
+        return config_path, os.stat(config_path)
+    except FileNotFoundError:
+        return config_path, None
+
+@functools.lru_cache(maxsize=4)
+def _scan_projects(projects_dir, dir_mtime_ns):
+    """List (name, path, config_path) for every project directory.
+    Keyed on the directory's mtime, which changes whenever a project is added or removed.
+    """
+    with os.scandir(projects_dir) as it:
+        return tuple((entry.name, entry.path, os.path.join(entry.path, 'supabase_config.json'))
+                     for entry in it if entry.is_dir())
+
+# {(path, config mtime, statuses): rendered project_card.html}
+_card_cache = {}
+_MAX_CARDS = 1024
+
+async def _render_card(project):
+    """Render a project's table row, reusing it while its config and statuses are unchanged"""
+    key = (project['path'], project['config_mtime_ns'], tuple(project['service_status'].items()))
+    card = _card_cache.get(key)
+    if card is None:
+        card = Markup(await render_template('project_card.html', project=project))
+        # Edited templates have to show up while developing
+        if not app.config['TEMPLATES_AUTO_RELOAD']:
+            if len(_card_cache) >= _MAX_CARDS:
+                _card_cache.clear()
+            _card_cache[key] = card
+    return card
 
 @app.route('/projects')
-def list_projects():
+async def list_projects():
     projects = []
-    if os.path.exists(generator.projects_dir):
-        for project_name in os.listdir(generator.projects_dir):
-            project_path = os.path.join(generator.projects_dir, project_name)
-            if os.path.isdir(project_path):
-                config_path = os.path.join(project_path, 'supabase_config.json')
-                if os.path.exists(config_path):
-                    with open(config_path, 'r') as f:
-                        config = json.load(f)
-                        
-                        # Check service status for each port
-                        service_status = {}
-                        ports = config.get('ports', {})
-                        for service, port in ports.items():
-                            service_status[service] = generator.get_service_status(port)
-                        # Clean created_at (avoid byte-string artifacts like b'...\n')
-                        raw_created = config.get('created_at', 'Unknown')
-                        if isinstance(raw_created, str):
-                            created_at = raw_created.strip()
-                            # remove leading b' or b"
-                            if created_at.startswith("b'") and created_at.endswith("'"):
-                                created_at = created_at[2:].strip("'")
-                            elif created_at.startswith('b"') and created_at.endswith('"'):
-                                created_at = created_at[2:].strip('"')
-                            # strip trailing escaped newlines if present
-                            created_at = created_at.replace('\\n', '').strip()
-                        else:
-                            created_at = str(raw_created)
-
-                        projects.append({
-                            'name': project_name,
-                            'path': project_path,
-                            'created_at': created_at,
-                            'machine_size': config.get('machine_size', 'Unknown'),
-                            'specs': config.get('specs', 'Unknown'),
-                            'machine_ip': config.get('machine_ip', 'Unknown'),
-                            'ports': ports,
-                            'service_status': service_status
-                        })
-    return render_template('projects.html', projects=projects)
+    try:
+        entries = _scan_projects(get_generator().projects_dir, os.stat(get_generator().projects_dir).st_mtime_ns)
+    except FileNotFoundError:
+        entries = ()
+    for project_name, project_path, config_path in entries:
+        try:
+            st = os.stat(config_path)
+            config = load_config(config_path, st)
+        except (OSError, ValueError):
+            # Missing, unreadable, or still being written by a creation job
+            continue
+        
+        ports = config.get('ports', {})
+        # Clean created_at (avoid byte-string artifacts like b'...\n')
+        raw_created = str(config.get('created_at', 'Unknown')).strip()
+        m = _CREATED_AT_RE.match(raw_created)
+        created_at = (m.group(2) if m else raw_created).replace('\\n', '').strip()
+
+        projects.append({
+            'name': project_name,
+            'path': project_path,
+            'created_at': created_at,
+            'machine_size': config.get('machine_size', 'Unknown'),
+            'specs': config.get('specs', 'Unknown'),
+            'machine_ip': config.get('machine_ip', 'Unknown'),
+            'ports': ports,
+            'config_mtime_ns': st.st_mtime_ns
+        })
+
+    # Check service status for every project's ports in one batch
+    statuses = await _bulk_statuses([p['ports'] for p in projects])
+    project_rows = []
+    for project, service_status in zip(projects, statuses):
+        project['service_status'] = service_status
+        project_rows.append(await _render_card(project))
+    return await render_template('projects.html', projects=projects, project_rows=project_rows)
 
 @app.route('/api/project/<project_name>/status')
-def project_status_api(project_name):
+async def project_status_api(project_name):
     """API endpoint to get real-time project status"""
     try:
-        config_path = os.path.join(generator.projects_dir, project_name, 'supabase_config.json')
-        if not os.path.exists(config_path):
+        config_path, st = _config_stat(project_name)
+        if st is None:
             return jsonify({'error': 'Project not found'}), 404
             
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = load_config(config_path, st)
         
         # Compute status per port using get_service_status
         ports = config.get('ports', {})
-        service_status = {svc: generator.get_service_status(port) for svc, port in ports.items()}
+        service_status = await _service_statuses(ports)
         
         return jsonify({
             'project_name': project_name,
@@ -155,85 +395,118 @@ def project_status_api(project_name):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/project/<project_name>/start', methods=['POST'])
-def start_project_api(project_name):
-    """API endpoint to start a project"""
-    try:
-        project_path = os.path.join(generator.projects_dir, project_name)
-        if not os.path.exists(project_path):
-            return jsonify({'success': False, 'message': 'Project not found'}), 404
-        
-        # Use existing generator and capture details
-        result = generator.start_project(project_name)
-        if isinstance(result, tuple):
-            success, out, err = result
-        else:
-            success, out, err = (bool(result), '', '')
-
-        if success:
-            return jsonify({'success': True, 'message': f'Project {project_name} started successfully', 'stdout': out, 'stderr': err})
-        else:
-            return jsonify({'success': False, 'message': f'Failed to start project {project_name}', 'stdout': out, 'stderr': err})
-    except Exception as e:
-        return jsonify({'success': False, 'message': str(e)}), 500
+def _make_action_api(action, past_tense):
+    """Register POST /api/project/<name>/<action>, running the generator's <action>_project"""
+    
+    async def handler(project_name):
+        try:
+            generator = get_generator()
+            if not os.access(os.path.join(generator.projects_dir, project_name), os.F_OK):
+                return jsonify({'success': False, 'message': 'Project not found'}), 404
+            
+            # Docker commands block, run them off the event loop
+            result = await asyncio.to_thread(getattr(generator, f'{action}_project'), project_name)
+            success, out, err = result if isinstance(result, tuple) else (bool(result), '', '')
+            
+            if success:
+                message = f'Project {project_name} {past_tense} successfully'
+            else:
+                message = f'Failed to {action} project {project_name}'
+            return jsonify({'success': success, 'message': message, 'stdout': out, 'stderr': err})
+        except Exception as e:
+            return jsonify({'success': False, 'message': str(e)}), 500
+    
+    handler.__doc__ = f"API endpoint to {action} a project"
+    app.add_url_rule(f'/api/project/<project_name>/{action}', f'{action}_project_api',
+                     handler, methods=['POST'])
 
-@app.route('/api/project/<project_name>/stop', methods=['POST'])  
-def stop_project_api(project_name):
-    """API endpoint to stop a project"""
-    try:
-        project_path = os.path.join(generator.projects_dir, project_name)
-        if not os.path.exists(project_path):
-            return jsonify({'success': False, 'message': 'Project not found'}), 404
-        
-        result = generator.stop_project(project_name)
-        if isinstance(result, tuple):
-            success, out, err = result
-        else:
-            success, out, err = (bool(result), '', '')
+for _action, _past_tense in (('start', 'started'), ('stop', 'stopped'), ('delete', 'deleted')):
+    _make_action_api(_action, _past_tense)
 
-        if success:
-            return jsonify({'success': True, 'message': f'Project {project_name} stopped successfully', 'stdout': out, 'stderr': err})
-        else:
-            return jsonify({'success': False, 'message': f'Failed to stop project {project_name}', 'stdout': out, 'stderr': err})
-    except Exception as e:
-        return jsonify({'success': False, 'message': str(e)}), 500
+# Queues of the connected /api/projects/stream clients
+_subscribers = set()
+_watcher_task = None
+# Seconds between project scans while anyone is subscribed
+_WATCH_INTERVAL = 5.0
+# Seconds of silence after which a comment is sent to keep the stream open
+_KEEPALIVE_INTERVAL = 15.0
 
-@app.route('/api/project/<project_name>/delete', methods=['POST'])
-def delete_project_api(project_name):
-    """API endpoint to delete a project"""
+async def _projects_snapshot():
+    """{name: {'mtime_ns', 'status'}} for every project, compared to detect changes"""
     try:
-        project_path = os.path.join(generator.projects_dir, project_name)
-        if not os.path.exists(project_path):
-            return jsonify({'success': False, 'message': 'Project not found'}), 404
-        
-        result = generator.delete_project(project_name)
-        if isinstance(result, tuple):
-            success, out, err = result
-        else:
-            success, out, err = (bool(result), '', '')
+        entries = _scan_projects(get_generator().projects_dir, os.stat(get_generator().projects_dir).st_mtime_ns)
+    except FileNotFoundError:
+        entries = ()
+    mtimes, ports = {}, {}
+    for project_name, _, config_path in entries:
+        try:
+            st = os.stat(config_path)
+            ports[project_name] = load_config(config_path, st).get('ports', {})
+        except (OSError, ValueError):
+            # Missing, unreadable, or still being written by a creation job
+            continue
+        mtimes[project_name] = st.st_mtime_ns
+    statuses = await _bulk_statuses(list(ports.values()))
+    return {name: {'mtime_ns': mtimes[name], 'status': status}
+            for name, status in zip(ports, statuses)}
 
-        if success:
-            return jsonify({'success': True, 'message': f'Project {project_name} deleted successfully', 'stdout': out, 'stderr': err})
+async def _watch_projects():
+    """Scan projects while there are subscribers, pushing each changed snapshot to them"""
+    # The first scan is only the baseline changes are detected against
+    last = None
+    while _subscribers:
+        try:
+            current = await _projects_snapshot()
+        except Exception:
+            # A failed scan must not end the task, the next tick tries again
+            app.logger.exception("Project scan failed")
         else:
-            return jsonify({'success': False, 'message': f'Failed to delete project {project_name}', 'stdout': out, 'stderr': err})
-    except Exception as e:
-        return jsonify({'success': False, 'message': str(e)}), 500
+            if last is not None and current != last:
+                for queue in _subscribers:
+                    # Clients only need the latest state, replace anything still unread
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(current)
+            last = current
+        await asyncio.sleep(_WATCH_INTERVAL)
 
-@app.route('/api/projects/status')
-def projects_status_api():
-    """API endpoint to check if projects status has changed"""
-    try:
-        # Simple check - could be enhanced with caching/timestamps
-        return jsonify({'should_refresh': True})
-    except Exception as e:
-        return jsonify({'should_refresh': False, 'error': str(e)})
+@app.route('/api/projects/stream')
+async def projects_stream():
+    """Server-Sent Events stream, one event whenever a project or its services change"""
+    global _watcher_task
+    queue = asyncio.Queue(maxsize=1)
+    _subscribers.add(queue)
+    if _watcher_task is None or _watcher_task.done():
+        _watcher_task = asyncio.create_task(_watch_projects())
+    
+    async def events():
+        try:
+            while True:
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), _KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b': keepalive\n\n'
+                    continue
+                yield f"data: {app.json.dumps(snapshot)}\n\n".encode()
+        finally:
+            _subscribers.discard(queue)
+    
+    response = await make_response(events(), {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # The stream stays open for as long as the page does
+    response.timeout = None
+    return response
 
 @app.route('/logs')
-def get_logs():
-    """Get current creation logs"""
-    logs = generator.logger.get_logs()
+async def get_logs():
+    """Get the logs of the most recent creation job"""
+    job = next(reversed(_jobs.values()), None)
+    logs = _job_logs(job) if job else []
     return {'logs': logs}
 
 if __name__ == '__main__':
     # Use port 5000 to avoid conflict with Kong service
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=_DEBUG, use_reloader=_DEBUG)
@@ -16,9 +16,18 @@ if ! command -v docker &> /dev/null; then
     echo "Warning: Docker is not installed. Docker is required to run Supabase projects."
 fi
 
-# Install dependencies if not already installed
+# Install dependencies if not already installed. pip's own check takes
+# seconds, so skip it while requirements.txt matches the last good install
 echo "Checking dependencies..."
-pip3 install -r /workspace/config/requirements.txt --quiet
+REQUIREMENTS=/workspace/config/requirements.txt
+DEPS_MARKER="${XDG_CACHE_HOME:-$HOME/.cache}/supabase_generator/deps_ok"
+REQUIREMENTS_HASH="$(sha256sum "$REQUIREMENTS" | cut -d' ' -f1)"
+if [ "$(cat "$DEPS_MARKER" 2>/dev/null)" = "$REQUIREMENTS_HASH" ]; then
+    echo "Dependencies already installed"
+elif pip3 install -r "$REQUIREMENTS" --quiet; then
+    mkdir -p "$(dirname "$DEPS_MARKER")"
+    echo "$REQUIREMENTS_HASH" > "$DEPS_MARKER"
+fi
 
 # Set environment variables for database (can be overridden)
 export SUPABASE_DB_HOST="${SUPABASE_DB_HOST:-192.168.1.43}"
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+"""
+Test script to verify the pre-rendered CLI help matches what argparse prints
+"""
+
+import os
+import sys
+sys.path.append('/root/supabase_project_generator')
+
+from src.cli.cli import _STATIC_HELP, _build_parser
+
+def test_static_help_matches_argparse():
+    """Test that the static help text is in sync with the real parser"""
+    print("Testing static CLI help...")
+    
+    # argparse wraps to the terminal width, render at a fixed one
+    old_columns = os.environ.get('COLUMNS')
+    os.environ['COLUMNS'] = '80'
+    try:
+        parser = _build_parser([])
+        parser.prog = 'supabase'
+        expected = parser.format_help()
+    finally:
+        if old_columns is None:
+            del os.environ['COLUMNS']
+        else:
+            os.environ['COLUMNS'] = old_columns
+    
+    actual = _STATIC_HELP % {'prog': 'supabase'}
+    if actual == expected:
+        print("✓ Static help matches argparse output")
+    else:
+        print("✗ Static help is out of date")
+    assert actual == expected
+
+if __name__ == "__main__":
+    test_static_help_matches_argparse()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+"""
+Test script to verify the generated anon/service keys are valid Supabase JWTs
+"""
+
+import sys
+import hmac
+import base64
+sys.path.append('/root/supabase_project_generator')
+
+import jwt
+
+from src.core.main import SupabaseProjectGenerator
+
+def test_jwt_keys():
+    """Test that both keys decode with PyJWT and match its encoding"""
+    print("Testing JWT key generation...")
+    
+    generator = SupabaseProjectGenerator()
+    anon_key, service_key, secret_key, project_ref = generator.generate_jwt_keys("testref")
+    assert project_ref == "testref"
+    
+    # Without a ref one is generated and embedded in both keys
+    _, generated_key, generated_secret, generated_ref = generator.generate_jwt_keys()
+    assert len(generated_ref) == 20
+    assert jwt.decode(generated_key, generated_secret, algorithms=["HS256"])["ref"] == generated_ref
+    
+    # Both keys are signed with the same secret, key one HMAC and check copies of it
+    mac = hmac.new(secret_key.encode(), digestmod="sha256")
+    
+    for token, role in ((anon_key, "anon"), (service_key, "service_role")):
+        payload = jwt.decode(token, secret_key, algorithms=["HS256"])
+        assert payload["iss"] == "supabase"
+        assert payload["ref"] == "testref"
+        assert payload["role"] == role
+        assert payload["exp"] > payload["iat"]
+        assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+        signing_input, _, signature = token.encode().rpartition(b".")
+        expected = mac.copy()
+        expected.update(signing_input)
+        assert hmac.compare_digest(base64.urlsafe_b64decode(signature + b"=" * (-len(signature) % 4)),
+                                   expected.digest())
+        # Must be the exact token PyJWT would have produced
+        assert token == jwt.encode(payload, secret_key, algorithm="HS256")
+        print(f"✓ {role} key is valid")
+
+if __name__ == "__main__":
+    test_jwt_keys()